@@ -1,36 +1,64 @@
 import os
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 from .diffAnalyzer import analyze_diff
-from .codeAnalyzer import analyze_code
+from .codeAnalyzer import analyze_code_batch
 from .vectorStore import VectorStore
 from .feedbackSystem import FeedbackSystem
+from .fileScanner import iter_source_files
+from .symbolParser import preload_parsers
 
+# Files handed to each worker per round-trip, to amortize IPC overhead and
+# eslint start-up.
+REVIEW_CHUNKSIZE = 16
 
-class ReviewAgent:
-    def __init__(self):
-        self.vs = VectorStore()
-        self.fb = FeedbackSystem()
+# Shared worker pool, created on first directory review and reused after that.
+_POOL = None
 
-    def review_path(self, path, old_path=None):
-        try:
-            if os.path.isdir(path):
-                results = {}
-                for root, dirs, files in os.walk(path):
-                    for f in files:
-                        if f.endswith(('.js', '.py', '.ts')):
-                            p = os.path.join(root, f)
-                            results[p] = self.review_file(p, None)
-                return results
-            else:
-                return self.review_file(path, old_path)
-        except Exception as e:
-            return {'error': str(e)}
 
-    def review_file(self, path, old_path=None):
+def _worker_init():
+    # pay parser setup once per worker instead of once per file; the symbol
+    # regexes are already compiled when this module is imported
+    preload_parsers()
+
+
+def _get_pool():
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(initializer=_worker_init)
+        atexit.register(_POOL.shutdown)
+    return _POOL
+
+
+def _map_reviews(chunks, want_diff=False):
+    global _POOL
+    try:
+        return [r for chunk in _get_pool().map(partial(_review_files, want_diff=want_diff), chunks)
+                for r in chunk]
+    except BrokenProcessPool:
+        # a worker died; start a fresh pool on the next call
+        _POOL = None
+        raise
+
+
+def _review_files(pairs, want_diff=False):
+    """Read, diff and analyze (path, old_path) pairs; returns [(review, text)].
+
+    Kept at module level so it can run in worker processes. The embedding is
+    left to the caller so it can be batched in the main process. text is None
+    when the file could not be read.
+    """
+    reviewed = []
+    readable = []
+    for path, old_path in pairs:
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 new_text = f.read()
         except Exception as e:
-            return {'error': f'Cannot read {path}: {e}'}
+            reviewed.append(({'error': f'Cannot read {path}: {e}'}, None))
+            continue
 
         old_text = ''
         if old_path:
@@ -40,16 +68,55 @@ class ReviewAgent:
             except Exception:
                 old_text = ''
 
-        diff = analyze_diff(old_text, new_text)
-        analysis = analyze_code(path)
-        embedding = self.vs.get_embedding(new_text)
-
         review = {
             'path': path,
-            'diff': diff,
-            'analysis': analysis,
-            'embedding_len': len(embedding) if embedding else 0
+            'diff': analyze_diff(old_text, new_text, want_text=want_diff)
         }
+        reviewed.append((review, new_text))
+        readable.append((review, new_text))
+
+    # one eslint run covers every JS/TS file in the chunk; the texts are
+    # passed through so the analyzer does not read the files again
+    analyses = analyze_code_batch([r['path'] for r, _ in readable], [t for _, t in readable])
+    for (review, _), analysis in zip(readable, analyses):
+        review['analysis'] = analysis
+    return reviewed
+
+
+class ReviewAgent:
+    def __init__(self):
+        self.vs = VectorStore()
+        self.fb = FeedbackSystem()
+
+    def review_path(self, path, old_path=None, want_diff=False):
+        try:
+            if os.path.isdir(path):
+                paths = list(iter_source_files(path))
+                if not paths:
+                    return {}
+                # files are independent, so parse/analyze them in parallel
+                chunks = [[(p, None) for p in paths[i:i + REVIEW_CHUNKSIZE]]
+                          for i in range(0, len(paths), REVIEW_CHUNKSIZE)]
+                reviewed = _map_reviews(chunks, want_diff=want_diff)
+                embeddings = iter(self.vs.get_embeddings([t for _, t in reviewed if t is not None]))
+                results = {}
+                for p, (review, text) in zip(paths, reviewed):
+                    if text is not None:
+                        embedding = next(embeddings)
+                        review['embedding_len'] = len(embedding) if embedding is not None else 0
+                    results[p] = review
+                return results
+            else:
+                return self.review_file(path, old_path, want_diff=want_diff)
+        except Exception as e:
+            return {'error': str(e)}
+
+    def review_file(self, path, old_path=None, want_diff=False):
+        review, text = _review_files([(path, old_path)], want_diff=want_diff)[0]
+        if text is None:
+            return review
+        embedding = self.vs.get_embedding(text)
+        review['embedding_len'] = len(embedding) if embedding is not None else 0
         return review
 
 
@@ -22,6 +22,7 @@ def main():
     sub_review = sub.add_parser('review')
     sub_review.add_argument('path')
     sub_review.add_argument('-o', '--old', default=None)
+    sub_review.add_argument('--show-diff', action='store_true')
 
     sub_feedback = sub.add_parser('feedback')
 
@@ -35,7 +36,7 @@ def main():
         print('Indexing complete.')
     elif args.command == 'review':
         agent = ReviewAgent()
-        result = agent.review_path(args.path, old_path=args.old)
+        result = agent.review_path(args.path, old_path=args.old, want_diff=args.show_diff)
         print(result)
     elif args.command == 'feedback':
         fb = FeedbackSystem()
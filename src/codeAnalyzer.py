@@ -1,41 +1,72 @@
 import subprocess
-import json
 import shutil
 import os
-from .pythonParser import parse_python
+from .symbolParser import parse_symbols, language_for
+from .jsonCodec import loads
 
+# Resolved once at import instead of scanning PATH for every file.
+ESLINT = shutil.which('eslint')
+LINT_EXTS = ('.js', '.ts')
 
-def run_eslint(path):
-    if shutil.which('eslint'):
-        try:
-            out = subprocess.check_output(['eslint', path, '--format', 'json'], stderr=subprocess.DEVNULL)
-            return json.loads(out)
-        except Exception:
-            return None
-    return None
+
+def run_eslint(paths):
+    """Lint several files with one eslint process; returns {path: [result]}."""
+    paths = list(paths)
+    if not ESLINT or not paths:
+        return {}
+    try:
+        # eslint exits 1 when it reports problems, so read stdout regardless
+        proc = subprocess.run([ESLINT, *paths, '--format', 'json'],
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        results = loads(proc.stdout)
+    except Exception:
+        return {}
+    by_abspath = {os.path.abspath(p): p for p in paths}
+    lint = {}
+    for res in results:
+        path = by_abspath.get(os.path.abspath(res.get('filePath', '')))
+        if path:
+            lint[path] = [res]
+    return lint
 
 
-def analyze_code(path):
+def _analyze(path, text=None):
+    # returns (info, has_console); has_console is None if the file was unreadable
     info = {'path': path, 'issues': [], 'symbols': {}}
+    has_console = None
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            text = f.read()
-        if path.endswith('.py'):
-            info['symbols'] = parse_python(text)
-        else:
-            # fallback: simple symbol extraction
-            from .codeParser import extract_symbols
-            info['symbols'] = extract_symbols(text)
-        lint = run_eslint(path)
-        if lint:
-            info['issues'] = lint
-        else:
-            # basic checks
-            if 'console.' in text:
-                info['issues'].append({'type': 'debug', 'message': 'console statements present'})
+        if text is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        has_console = 'console.' in text
+        info['symbols'] = parse_symbols(text, language_for(path))
     except Exception as e:
         info['error'] = str(e)
-    return info
+    return info, has_console
+
+
+def analyze_code_batch(paths, texts=None):
+    """Analyze several files, running eslint once for all JS/TS among them.
+
+    texts, when given, holds the already-read contents of paths so the files
+    are not read again.
+    """
+    if texts is None:
+        texts = [None] * len(paths)
+    analyzed = [_analyze(p, t) for p, t in zip(paths, texts)]
+    lint = run_eslint(p for p, (_, has_console) in zip(paths, analyzed)
+                      if has_console is not None and p.endswith(LINT_EXTS))
+    for p, (info, has_console) in zip(paths, analyzed):
+        if p in lint:
+            info['issues'] = lint[p]
+        elif has_console:
+            # basic checks
+            info['issues'].append({'type': 'debug', 'message': 'console statements present'})
+    return [info for info, _ in analyzed]
+
+
+def analyze_code(path, text=None):
+    return analyze_code_batch([path], [text])[0]
 
 
 if __name__ == '__main__':
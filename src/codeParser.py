@@ -1,20 +1,34 @@
 import re
+from functools import lru_cache
 
-FUNC_RE = re.compile(r'(?:function\s+([\w$]+)\s*\(|([\w$]+)\s*=\s*\([^)]*\)\s*=>)')
-CLASS_RE = re.compile(r'class\s+([\w$]+)')
+
+@lru_cache(maxsize=None)
+def _compile(source, flags=0):
+    return re.compile(source, flags)
+
+
+# One alternation so finditer scans the text once for both symbol kinds. Each
+# branch has a single named group, so m.lastgroup tells which one matched.
+SYMBOL_RE = _compile(
+    r'\bfunction(?:\s*\*\s*|\s+)(?P<fn>[\w$]+)\s*\('                        # function foo(
+    r'|(?P<arrow>[\w$]+)\s*=\s*(?:async\s+)?(?:\([^)]*\)|[\w$]+)\s*=>'      # foo = (a) => / foo = async a =>
+    r'|\bclass\s+(?!extends\b)(?P<cls>[\w$]+)'                              # class Foo
+    # stop before `class` so a named class expression also yields its own name
+    r'|(?P<cls_expr>[\w$]+)\s*=\s*(?=class\b)'                              # Foo = class Bar {}
+)
+FUNCTION_GROUPS = frozenset({'fn', 'arrow'})
 
 
 def extract_symbols(js_text):
     """Very small heuristic extractor for JS/TS: returns functions and classes."""
-    functions = set()
-    classes = set()
-    for m in FUNC_RE.finditer(js_text):
-        name = m.group(1) or m.group(2)
-        if name:
-            functions.add(name)
-    for m in CLASS_RE.finditer(js_text):
-        classes.add(m.group(1))
-    return {'functions': sorted(list(functions)), 'classes': sorted(list(classes))}
+    # dicts dedupe while keeping first-seen order
+    functions = {}
+    classes = {}
+    for m in SYMBOL_RE.finditer(js_text):
+        kind = m.lastgroup
+        target = functions if kind in FUNCTION_GROUPS else classes
+        target[m.group(kind)] = None
+    return {'functions': list(functions), 'classes': list(classes)}
 
 
 if __name__ == '__main__':
@@ -1,13 +1,55 @@
 import difflib
+from collections import Counter
 
 
-def analyze_diff(old_text, new_text):
+def _format_range(start, stop):
+    # unified diff hunk range, formatted the way difflib.unified_diff does
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f'{beginning},{length}'
+
+
+def analyze_diff(old_text, new_text, want_text=False):
+    if not want_text:
+        # counting lines as multisets is enough for stats and skips the
+        # O(N*M) SequenceMatcher behind unified_diff
+        old_counts = Counter(old_text.splitlines())
+        new_counts = Counter(new_text.splitlines())
+        return {
+            'added': sum((new_counts - old_counts).values()),
+            'removed': sum((old_counts - new_counts).values()),
+            'diff': None
+        }
     old_lines = old_text.splitlines(keepends=True)
     new_lines = new_text.splitlines(keepends=True)
-    diff = list(difflib.unified_diff(old_lines, new_lines, lineterm=''))
+    # build the unified diff and the stats from the same opcodes in one pass;
+    # autojunk's popularity heuristic misfires on repetitive code lines
+    sm = difflib.SequenceMatcher(a=old_lines, b=new_lines, autojunk=False)
+    added = removed = 0
+    diff = []
+    for group in sm.get_grouped_opcodes(3):
+        if not diff:
+            diff += ['--- ', '+++ ']
+        first, last = group[0], group[-1]
+        diff.append('@@ -{} +{} @@'.format(_format_range(first[1], last[2]),
+                                           _format_range(first[3], last[4])))
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                diff.extend(' ' + line for line in old_lines[i1:i2])
+                continue
+            if tag in ('replace', 'delete'):
+                removed += i2 - i1
+                diff.extend('-' + line for line in old_lines[i1:i2])
+            if tag in ('replace', 'insert'):
+                added += j2 - j1
+                diff.extend('+' + line for line in new_lines[j1:j2])
     stats = {
-        'added': sum(1 for l in diff if l.startswith('+') and not l.startswith('+++')),
-        'removed': sum(1 for l in diff if l.startswith('-') and not l.startswith('---')),
+        'added': added,
+        'removed': removed,
         'diff': ''.join(diff)
     }
     return stats
@@ -16,4 +58,4 @@ def analyze_diff(old_text, new_text):
 if __name__ == '__main__':
     a = 'a\nb\nc\n'
     b = 'a\nB\nc\nd\n'
-    print(analyze_diff(a, b))
+    print(analyze_diff(a, b, want_text=True))
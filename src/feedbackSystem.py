@@ -1,32 +1,45 @@
 import os
-import json
+from .jsonCodec import dumps, loads
 
-FB_PATH = os.path.join(os.getcwd(), '.code-connoisseur', 'feedback.json')
+FB_PATH = os.path.join(os.getcwd(), '.code-connoisseur', 'feedback.jsonl')
+# Pre-JSONL store: a single {"feedback": [...]} document.
+LEGACY_FB_PATH = os.path.join(os.getcwd(), '.code-connoisseur', 'feedback.json')
 
 
 class FeedbackSystem:
     def __init__(self):
         os.makedirs(os.path.dirname(FB_PATH), exist_ok=True)
         if not os.path.exists(FB_PATH):
-            with open(FB_PATH, 'w', encoding='utf-8') as f:
-                json.dump({'feedback': []}, f)
+            self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        records = []
+        try:
+            with open(LEGACY_FB_PATH, 'rb') as f:
+                records = loads(f.read()).get('feedback', [])
+        except Exception:
+            pass
+        with open(FB_PATH, 'wb') as f:
+            for rec in records:
+                f.write(dumps(rec) + b'\n')
 
     def add(self, review_id, score, comment=None):
-        with open(FB_PATH, 'r+', encoding='utf-8') as f:
-            data = json.load(f)
-            data['feedback'].append({'id': review_id, 'score': score, 'comment': comment})
-            f.seek(0)
-            json.dump(data, f, indent=2)
-            f.truncate()
+        # append-only: one JSON record per line, no rewrite of earlier entries
+        with open(FB_PATH, 'ab') as f:
+            f.write(dumps({'id': review_id, 'score': score, 'comment': comment}) + b'\n')
 
     def summary(self):
-        with open(FB_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        fb = data.get('feedback', [])
-        if not fb:
+        total = 0
+        count = 0
+        with open(FB_PATH, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                total += loads(line).get('score', 0)
+                count += 1
+        if not count:
             return {'count': 0}
-        avg = sum(x.get('score', 0) for x in fb) / len(fb)
-        return {'count': len(fb), 'avg_score': avg}
+        return {'count': count, 'avg_score': total / count}
 
 
 if __name__ == '__main__':
@@ -0,0 +1,36 @@
+import os
+
+SOURCE_EXTS = ('.py', '.js', '.ts')
+# Vendored or generated trees that never hold sources worth reviewing.
+SKIP_DIRS = frozenset({'node_modules', '.git', '__pycache__', 'venv', '.venv'})
+
+
+def iter_source_files(root, exts=SOURCE_EXTS, skip_dirs=SKIP_DIRS):
+    """Yield paths under root ending in exts, pruning skip_dirs by name.
+
+    Uses os.scandir so entry types come from the directory listing itself and
+    files are filtered by name without an extra stat. Like os.walk, symlinked
+    directories are not followed and unreadable directories are skipped.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if entry.name not in skip_dirs:
+                        stack.append(entry.path)
+                elif entry.name.endswith(exts):
+                    yield entry.path
+
+
+if __name__ == '__main__':
+    for p in iter_source_files('.'):
+        print(p)
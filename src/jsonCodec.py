@@ -0,0 +1,30 @@
+import json
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+def _default(obj):
+    # NumPy values orjson cannot serialize natively (and all of them on the
+    # stdlib path) fall back to plain lists and scalars
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+if orjson:
+    def dumps(obj):
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    loads = orjson.loads
+else:
+    def dumps(obj):
+        return json.dumps(obj, default=_default).encode('utf-8')
+
+    loads = json.loads
+
+
+if __name__ == '__main__':
+    print(dumps({'orjson': orjson is not None}))
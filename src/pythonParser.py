@@ -3,13 +3,22 @@ import ast
 
 def parse_python(source):
     tree = ast.parse(source)
-    symbols = {'functions': [], 'classes': []}
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            symbols['functions'].append(node.name)
-        elif isinstance(node, ast.ClassDef):
-            symbols['classes'].append(node.name)
-    return symbols
+    functions = []
+    classes = []
+    fn_append = functions.append
+    cls_append = classes.append
+    # Only module and class bodies can hold the symbols we report, so skip
+    # walking every expression node in the tree. Appending to `bodies` while
+    # iterating it gives the same breadth-first order as ast.walk.
+    bodies = [tree.body]
+    for body in bodies:
+        for node in body:
+            if isinstance(node, ast.FunctionDef):
+                fn_append(node.name)
+            elif isinstance(node, ast.ClassDef):
+                cls_append(node.name)
+                bodies.append(node.body)
+    return {'functions': functions, 'classes': classes}
 
 
 if __name__ == '__main__':
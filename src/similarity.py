@@ -0,0 +1,68 @@
+import numpy as np
+
+# Compiled scoring kernel, or the NumPy version; resolved on first use so
+# importing this module (and every CLI command) does not pay for numba.
+_KERNEL = None
+
+
+def _cosine_scores_numpy(query, matrix):
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    scores = matrix @ query
+    return np.divide(scores, norms, out=np.zeros_like(scores), where=norms > 0)
+
+
+def _build_numba_kernel():
+    import numba
+
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def _cosine_scores(query, matrix):
+        n, d = matrix.shape
+        qn = 0.0
+        for j in range(d):
+            qn += query[j] * query[j]
+        qn = np.sqrt(qn)
+        out = np.zeros(n, dtype=np.float32)
+        for i in numba.prange(n):
+            dot = 0.0
+            mn = 0.0
+            for j in range(d):
+                v = matrix[i, j]
+                dot += v * query[j]
+                mn += v * v
+            if mn > 0.0 and qn > 0.0:
+                out[i] = dot / (np.sqrt(mn) * qn)
+        return out
+
+    return _cosine_scores
+
+
+def _get_kernel():
+    global _KERNEL
+    if _KERNEL is None:
+        try:
+            _KERNEL = _build_numba_kernel()
+        except Exception:
+            _KERNEL = _cosine_scores_numpy
+    return _KERNEL
+
+
+def cosine_topk(query, matrix, k):
+    """Return (indices, scores) of the k rows of matrix most similar to query.
+
+    Uses a Numba-compiled kernel when numba is installed and plain NumPy
+    otherwise. Inputs are cast to contiguous float32 either way.
+    """
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    k = min(k, matrix.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+    scores = _get_kernel()(query, matrix)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    idx = idx[np.argsort(-scores[idx])]
+    return idx, scores[idx]
+
+
+if __name__ == '__main__':
+    m = np.array([[1, 0], [0, 1], [1, 1]], dtype=np.float32)
+    print(cosine_topk(np.array([1, 0.2]), m, 2))
@@ -0,0 +1,135 @@
+import warnings
+from .pythonParser import parse_python
+from .codeParser import extract_symbols
+
+try:
+    import tree_sitter_languages
+except Exception:
+    tree_sitter_languages = None
+
+EXT_LANGUAGES = {'.py': 'python', '.js': 'javascript', '.ts': 'typescript'}
+
+_JS_FUNCTION_DECLS = {'function_declaration', 'generator_function_declaration'}
+_JS_CLASS_DECLS = {'class_declaration', 'abstract_class_declaration'}
+_JS_FUNCTION_VALUES = {'arrow_function', 'function', 'function_expression', 'generator_function'}
+_JS_CLASS_VALUES = {'class'}
+
+# One parser per language, created on first use and shared by every file.
+_PARSERS = {}
+
+
+def language_for(path):
+    for ext, language in EXT_LANGUAGES.items():
+        if path.endswith(ext):
+            return language
+    return 'javascript'
+
+
+def get_parser(language):
+    """Return the shared tree-sitter parser for language, or None."""
+    if language not in _PARSERS:
+        parser = None
+        if tree_sitter_languages is not None:
+            try:
+                # older tree_sitter_languages builds trip a deprecation warning
+                # in tree_sitter on every load; keep it off the CLI output
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', FutureWarning)
+                    parser = tree_sitter_languages.get_parser(language)
+            except Exception:
+                parser = None
+        _PARSERS[language] = parser
+    return _PARSERS[language]
+
+
+def preload_parsers():
+    for language in set(EXT_LANGUAGES.values()):
+        get_parser(language)
+
+
+def _name(node):
+    name = node.child_by_field_name('name')
+    return name.text.decode('utf-8', 'replace') if name is not None else None
+
+
+def _python_symbols(root):
+    # same shape as parse_python: module and class bodies, breadth-first
+    functions = []
+    classes = []
+    bodies = [root.children]
+    for body in bodies:
+        for node in body:
+            if node.type == 'decorated_definition':
+                node = node.child_by_field_name('definition')
+            if node.type == 'function_definition':
+                # ast reports `async def` separately, and parse_python skips it
+                if node.children[0].type != 'async':
+                    functions.append(_name(node))
+            elif node.type == 'class_definition':
+                classes.append(_name(node))
+                bodies.append(node.child_by_field_name('body').children)
+    return {'functions': functions, 'classes': classes}
+
+
+def _js_target(node):
+    # name bound by a declarator or assignment: `foo = ...`, `a.b.foo = ...`
+    if node.type == 'variable_declarator':
+        target = node.child_by_field_name('name')
+    else:
+        target = node.child_by_field_name('left')
+        if target is not None and target.type == 'member_expression':
+            target = target.child_by_field_name('property')
+    if target is None or target.type not in ('identifier', 'property_identifier'):
+        return None
+    return target.text.decode('utf-8', 'replace')
+
+
+def _js_symbols(root):
+    # same shape as extract_symbols: deduplicated, first-seen order. The whole
+    # tree is walked so nested declarations and assignments are found too.
+    functions = {}
+    classes = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        kind = node.type
+        if kind in _JS_FUNCTION_DECLS or kind in _JS_FUNCTION_VALUES:
+            functions[_name(node)] = None
+        elif kind in _JS_CLASS_DECLS or kind in _JS_CLASS_VALUES:
+            classes[_name(node)] = None
+        elif kind in ('variable_declarator', 'assignment_expression'):
+            value = node.child_by_field_name('value' if kind == 'variable_declarator' else 'right')
+            if value is not None and value.type in _JS_FUNCTION_VALUES:
+                functions[_js_target(node)] = None
+            elif value is not None and value.type in _JS_CLASS_VALUES:
+                classes[_js_target(node)] = None
+        # children in reverse so they pop in source order
+        stack.extend(reversed(node.named_children))
+    # anonymous functions and classes have no name
+    functions.pop(None, None)
+    classes.pop(None, None)
+    return {'functions': list(functions), 'classes': list(classes)}
+
+
+def parse_symbols(source, language):
+    """Extract top-level functions and classes from source text.
+
+    Uses a shared tree-sitter parser when tree_sitter_languages is installed,
+    falling back to the ast parser for Python and the regex extractor for
+    JS/TS otherwise.
+    """
+    parser = get_parser(language)
+    if parser is None:
+        return parse_python(source) if language == 'python' else extract_symbols(source)
+    root = parser.parse(source.encode('utf-8')).root_node
+    if language == 'python':
+        if root.has_error:
+            # let ast raise the SyntaxError so callers still see it
+            return parse_python(source)
+        return _python_symbols(root)
+    return _js_symbols(root)
+
+
+if __name__ == '__main__':
+    print(parse_symbols('def f():\n    pass\nclass C: pass\n', 'python'))
+    print(parse_symbols('function foo(){}\nconst bar = () => {}\nclass Baz {}\n', 'javascript'))
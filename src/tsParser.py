@@ -1,9 +1,10 @@
-# For TypeScript parsing we fall back to the same heuristic as codeParser
-from .codeParser import extract_symbols
+# TypeScript goes through the shared tree-sitter parser when it is installed,
+# otherwise the same heuristic as codeParser
+from .symbolParser import parse_symbols
 
 
 def parse_typescript(source):
-    return extract_symbols(source)
+    return parse_symbols(source, 'typescript')
 
 
 if __name__ == '__main__':
@@ -1,49 +1,310 @@
 import os
-import json
+import time
+import hashlib
+import random
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from dotenv import load_dotenv
+from .similarity import cosine_topk
+from .fileScanner import iter_source_files
+from .jsonCodec import dumps, loads
 
 try:
     import openai
 except Exception:
     openai = None
 
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
+
 load_dotenv()
 
 INDEX_DIR = os.path.join(os.getcwd(), '.code-connoisseur', 'vectors')
 os.makedirs(INDEX_DIR, exist_ok=True)
+# absolute path -> [mtime_ns, size, content hash] for files with a stored vector
+MANIFEST_PATH = os.path.join(os.getcwd(), '.code-connoisseur', 'manifest.json')
+
+EMBEDDING_MODEL = 'text-embedding-3-small'
+# Per-request limits: batches are packed greedily up to both.
+BATCH_SIZE = 2048
+BATCH_TOKEN_BUDGET = 250000
+# Single inputs are cut to the model's token limit so one large file cannot
+# fail a whole batch.
+MAX_INPUT_TOKENS = 8191
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+DEFAULT_CONCURRENCY = 5
+# Errors that may clear on a retry, by class name so both the 0.x
+# (openai.error) and 1.x client exceptions match.
+TRANSIENT_ERRORS = frozenset({'RateLimitError', 'Timeout', 'APITimeoutError',
+                              'APIConnectionError', 'ServiceUnavailableError', 'TryAgain'})
+
+
+def _fallback_embedding(text):
+    # fallback: simple byte-level vector, built with one vectorized divide
+    data = text[:1024].encode('utf-8', errors='replace')[:1024]
+    return np.frombuffer(data, dtype=np.uint8).astype(np.float32) / 1000.0
+
+
+def _content_hash(text):
+    # blake2b is faster than sha256 and plenty for cache keys
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _get_encoder():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(EMBEDDING_MODEL)
+    except Exception:
+        # e.g. the BPE file cannot be downloaded
+        return None
+
+
+def _prepare_input(text):
+    # returns (api input, token count), truncated to the per-input limit
+    enc = _get_encoder()
+    if enc is None:
+        # every BPE token covers at least one UTF-8 byte, so the byte length
+        # bounds the token count even for minified code, base64 or CJK
+        data = text.encode('utf-8')
+        if len(data) > MAX_INPUT_TOKENS:
+            # drop a character split by the cut rather than send a broken one
+            data = data[:MAX_INPUT_TOKENS].decode('utf-8', 'ignore').encode('utf-8')
+        return data.decode('utf-8'), len(data)
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) > MAX_INPUT_TOKENS:
+        tokens = tokens[:MAX_INPUT_TOKENS]
+        text = enc.decode(tokens)
+    return text, len(tokens)
+
+
+def _retry_delay(exc, attempt):
+    # honour Retry-After on 429s, otherwise back off exponentially; the jitter
+    # keeps concurrent workers from retrying in lockstep
+    delay = RETRY_BASE_DELAY * 2 ** attempt
+    if getattr(exc, 'http_status', None) == 429:
+        headers = getattr(exc, 'headers', None) or {}
+        try:
+            delay = float(headers.get('Retry-After', delay))
+        except (TypeError, ValueError):
+            pass
+    return delay + random.uniform(0, RETRY_BASE_DELAY)
+
+
+def _is_transient(exc):
+    # rate limits, server errors and network trouble are worth a retry; a bad
+    # key, an invalid request or an incompatible client never succeeds
+    status = getattr(exc, 'http_status', None) or getattr(exc, 'status_code', None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return (type(exc).__name__ in TRANSIENT_ERRORS
+            or isinstance(exc, (TimeoutError, ConnectionError)))
+
+
+def _default_concurrency():
+    try:
+        return max(1, int(os.environ.get('CC_EMBED_CONCURRENCY', DEFAULT_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_CONCURRENCY
 
 
 class VectorStore:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, batch_size=BATCH_SIZE, max_workers=None):
         self.api_key = api_key or os.environ.get('OPENAI_API_KEY')
+        self.batch_size = batch_size
+        self.max_workers = max_workers or _default_concurrency()
+        # set on the first permanent API error; later calls use the fallback
+        self.api_failed = False
         if openai and self.api_key:
             openai.api_key = self.api_key
 
+    @staticmethod
+    def _vector_path(content_hash):
+        return os.path.join(INDEX_DIR, content_hash + '.npy')
+
+    def save_embedding(self, content_hash, emb):
+        # float16 halves the size of float32 and is plenty for similarity
+        np.save(self._vector_path(content_hash), np.asarray(emb, dtype=np.float16))
+
+    def load_embedding(self, content_hash):
+        """Return the stored vector for a content hash as float32, or None."""
+        try:
+            return np.load(self._vector_path(content_hash)).astype(np.float32)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _load_manifest():
+        try:
+            with open(MANIFEST_PATH, 'rb') as f:
+                manifest = loads(f.read())
+        except Exception:
+            return {}
+        # keys are absolute; this also folds in relative keys from older runs
+        return {os.path.abspath(p): entry for p, entry in manifest.items()}
+
     def get_embedding(self, text):
-        if openai and self.api_key:
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """Embed a list of texts, one API call per batch; order is preserved."""
+        texts = list(texts)
+        embs = self._embed_all(texts)
+        return [_fallback_embedding(t) if e is None else e for t, e in zip(texts, embs)]
+
+    def _embed_all(self, texts):
+        # API embeddings in input order; None where the API was unavailable
+        if not (openai and self.api_key) or self.api_failed:
+            return [None] * len(texts)
+        batches = list(self._iter_batches(list(texts)))
+        if len(batches) <= 1 or self.max_workers <= 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            # batches are network-bound, so overlap them with a bounded pool
+            results = [None] * len(batches)
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as ex:
+                futures = {ex.submit(self._embed_batch, batch): i for i, batch in enumerate(batches)}
+                for fut, i in futures.items():
+                    results[i] = fut.result()
+        return [emb for batch, res in zip(batches, results) for emb in (res or [None] * len(batch))]
+
+    def _iter_batches(self, texts):
+        batch = []
+        tokens = 0
+        for text in texts:
+            text, n_tok = _prepare_input(text)
+            if batch and (len(batch) >= self.batch_size or tokens + n_tok > BATCH_TOKEN_BUDGET):
+                yield batch
+                batch = []
+                tokens = 0
+            batch.append(text)
+            tokens += n_tok
+        if batch:
+            yield batch
+
+    def _embed_batch(self, texts):
+        if openai and self.api_key and not self.api_failed:
+            # the API rejects empty inputs, so only send the non-empty ones
+            idx = [i for i, t in enumerate(texts) if t]
+            if idx:
+                inputs = [texts[i] for i in idx]
+                for attempt in range(MAX_RETRIES):
+                    try:
+                        resp = openai.Embedding.create(model=EMBEDDING_MODEL, input=inputs)
+                        out = [[] for _ in texts]
+                        for item in resp['data']:
+                            out[idx[item['index']]] = item['embedding']
+                        return out
+                    except Exception as e:
+                        if not _is_transient(e):
+                            self.api_failed = True
+                            break
+                        if attempt + 1 < MAX_RETRIES:
+                            time.sleep(_retry_delay(e, attempt))
+        return None
+
+    def search(self, text, k=5):
+        """Return the k indexed files whose embeddings are closest to text."""
+        query = np.asarray(self.get_embedding(text), dtype=np.float32)
+        paths = []
+        vectors = []
+        # the manifest is keyed by absolute path, so files sharing a basename
+        # are all candidates
+        for path, entry in self._load_manifest().items():
+            emb = self.load_embedding(entry[2])
+            # API and fallback vectors differ in length and cannot be compared
+            if emb is not None and emb.shape == query.shape:
+                paths.append(path)
+                vectors.append(emb)
+        if not vectors:
+            return []
+        idx, scores = cosine_topk(query, np.stack(vectors), k)
+        return [{'path': paths[i], 'score': float(s)} for i, s in zip(idx, scores)]
+
+    def index_directory(self, directory):
+        # Simple index: filename -> JSON metadata, content hash -> .npy vector
+        manifest = self._load_manifest()
+        items = []
+        stats = []
+        seen = set()
+        # absolute paths, so `proj`, `./proj` and `/abs/proj` share entries
+        directory = os.path.abspath(directory)
+        for path in iter_source_files(directory):
+            seen.add(path)
             try:
-                resp = openai.Embedding.create(model='text-embedding-3-small', input=text)
-                return resp['data'][0]['embedding']
+                st = os.stat(path)
+                # unchanged since the last run (same mtime and size) and its
+                # vector is on disk: skip without reading the file at all
+                entry = manifest.get(path)
+                if (entry and entry[:2] == [st.st_mtime_ns, st.st_size]
+                        and os.path.exists(self._vector_path(entry[2]))):
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    items.append((path, os.path.basename(path), f.read()))
+                stats.append(st)
             except Exception:
-                pass
-        # fallback: simple character-level vector
-        return [float(ord(c)) / 1000.0 for c in text[:1024]]
+                continue
 
-    def index_directory(self, directory):
-        # Simple index: store filename -> embedding JSON files
-        for root, dirs, files in os.walk(directory):
-            for fname in files:
-                if fname.endswith(('.js', '.ts', '.py')):
-                    path = os.path.join(root, fname)
+        # vectors are stored per content hash, so only embed contents we have
+        # not seen before; fallback vectors are never stored so they get
+        # replaced once the API is reachable
+        hashes = [_content_hash(txt) for _, _, txt in items]
+        missing = {}
+        for h, (_, _, txt) in zip(hashes, items):
+            if not os.path.exists(self._vector_path(h)):
+                missing.setdefault(h, txt)
+        lengths = {}
+        for h, emb in zip(missing, self._embed_all(list(missing.values()))):
+            if emb is not None:
+                self.save_embedding(h, emb)
+                lengths[h] = len(emb)
+
+        for (path, fname, txt), h, st in zip(items, hashes, stats):
+            if h not in lengths:
+                emb = self.load_embedding(h)
+                if emb is not None:
+                    lengths[h] = len(emb)
+            if h in lengths:
+                manifest[path] = [st.st_mtime_ns, st.st_size, h]
+                embedding_len = lengths[h]
+            else:
+                embedding_len = len(_fallback_embedding(txt))
+            try:
+                out = {'path': path, 'hash': h, 'embedding_len': embedding_len}
+                name = fname + '.json'
+                with open(os.path.join(INDEX_DIR, name), 'wb') as g:
+                    g.write(dumps(out))
+            except Exception:
+                continue
+
+        # forget files under this directory that are gone; entries from other
+        # indexed directories are kept
+        prefix = os.path.join(directory, '')
+        stale = [p for p in manifest if p.startswith(prefix) and p not in seen]
+        for path in stale:
+            del manifest[path]
+
+        if items or stale:
+            with open(MANIFEST_PATH, 'wb') as f:
+                f.write(dumps(manifest))
+            self._collect_vectors(manifest)
+
+    @staticmethod
+    def _collect_vectors(manifest):
+        # the manifest is the only index of live vectors: delete any .npy left
+        # behind by an edited or removed file
+        live = {entry[2] + '.npy' for entry in manifest.values()}
+        with os.scandir(INDEX_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.npy') and entry.name not in live:
                     try:
-                        with open(path, 'r', encoding='utf-8') as f:
-                            txt = f.read()
-                        emb = self.get_embedding(txt)
-                        out = {'path': path, 'embedding_len': len(emb)}
-                        name = fname + '.json'
-                        with open(os.path.join(INDEX_DIR, name), 'w', encoding='utf-8') as g:
-                            json.dump(out, g)
-                    except Exception:
+                        os.remove(entry.path)
+                    except OSError:
                         continue
 
 